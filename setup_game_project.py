@@ -23,73 +23,165 @@ Usage:
 """
 
 import os
+import atexit
 import sys
 import argparse
 import time
+import random
 import re
 import json
 import requests
-from typing import List, Dict, Tuple, Optional
-from github import Github, GithubException
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import quote
+from pathlib import Path
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import List, Dict, Tuple, Optional, Iterator, NamedTuple
+
+# PyGithub is imported where it is used so --dry-run never pays its import cost
+
+# orjson is optional: when installed it replaces json for templates, caches, and GraphQL traffic
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class MilestoneDef(NamedTuple):
+    """A milestone created for each story category."""
+    title: str
+    description: str
+
+
+class ColumnDef(NamedTuple):
+    """A Kanban workflow column (Status option) on the project board."""
+    name: str
+    description: str
+    color: str
+    limit: Optional[int] = None
+
+
+class LabelDef(NamedTuple):
+    """A standard label created in the repository."""
+    name: str
+    color: str
+    description: str
 
 
 # 7 milestone categories for game development
-MILESTONES = [
-    {'title': 'Programming', 'description': 'Programming and technical implementation'},
-    {'title': 'Art', 'description': 'Visual art, graphics, and UI design'},
-    {'title': 'Audio', 'description': 'Sound effects and music systems'},
-    {'title': 'QA', 'description': 'Quality assurance, testing, and debugging'},
-    {'title': 'Documentation', 'description': 'Documentation and technical writing'},
-    {'title': 'Marketing', 'description': 'Marketing and promotional activities'},
-    {'title': 'Business', 'description': 'Business operations and analytics'},
-]
+MILESTONES = (
+    MilestoneDef('Programming', 'Programming and technical implementation'),
+    MilestoneDef('Art', 'Visual art, graphics, and UI design'),
+    MilestoneDef('Audio', 'Sound effects and music systems'),
+    MilestoneDef('QA', 'Quality assurance, testing, and debugging'),
+    MilestoneDef('Documentation', 'Documentation and technical writing'),
+    MilestoneDef('Marketing', 'Marketing and promotional activities'),
+    MilestoneDef('Business', 'Business operations and analytics'),
+)
+
+# Story ID codes for each category, keyed by lowercase category name (read-only)
+CATEGORY_CODES = MappingProxyType({
+    'programming': 'PROG',
+    'art': 'ART',
+    'audio': 'AUDIO',
+    'qa': 'QA',
+    'documentation': 'DOC',
+    'marketing': 'MKT',
+    'business': 'BUS',
+})
 
 # Kanban workflow columns for the project board (Projects V2)
-PROJECT_COLUMNS = [
-    {'name': 'Backlog', 'description': "This work hasn't been started", 'color': 'BLUE'},
-    {'name': 'On deck', 'description': 'This work is prioritized and ready to be worked on next', 'color': 'YELLOW', 'limit': 5},
-    {'name': 'In progress', 'description': 'This work is actively being worked on', 'color': 'GREEN', 'limit': 3},
-    {'name': 'Blocked', 'description': 'This work is blocked and cannot finish', 'color': 'RED', 'limit': 5},
-    {'name': 'In review', 'description': 'This work is done, and ready for review/QA', 'color': 'PINK', 'limit': 5},
-    {'name': 'Done', 'description': 'This work has been completed', 'color': 'PURPLE'},
-]
+PROJECT_COLUMNS = (
+    ColumnDef('Backlog', "This work hasn't been started", 'BLUE'),
+    ColumnDef('On deck', 'This work is prioritized and ready to be worked on next', 'YELLOW', limit=5),
+    ColumnDef('In progress', 'This work is actively being worked on', 'GREEN', limit=3),
+    ColumnDef('Blocked', 'This work is blocked and cannot finish', 'RED', limit=5),
+    ColumnDef('In review', 'This work is done, and ready for review/QA', 'PINK', limit=5),
+    ColumnDef('Done', 'This work has been completed', 'PURPLE'),
+)
 
 # Standard labels aligned with milestones
-STANDARD_LABELS = [
-    {'name': 'enhancement', 'color': 'a2eeef', 'description': 'New feature or request'},
-    {'name': 'bug', 'color': 'd73a4a', 'description': 'Something isn\'t working'},
-    {'name': 'Programming', 'color': '0e8a16', 'description': 'Programming and technical implementation'},
-    {'name': 'Art', 'color': 'fbca04', 'description': 'Visual art, graphics, and UI design'},
-    {'name': 'Audio', 'color': 'f9d0c4', 'description': 'Sound effects and music'},
-    {'name': 'QA', 'color': 'ededed', 'description': 'Quality assurance, testing, and debugging'},
-    {'name': 'Documentation', 'color': '0075ca', 'description': 'Documentation and technical writing'},
-    {'name': 'Marketing', 'color': 'ff69b4', 'description': 'Marketing and promotion'},
-    {'name': 'Business', 'color': 'd4c5f9', 'description': 'Business operations and analytics'},
-]
+STANDARD_LABELS = (
+    LabelDef('enhancement', 'a2eeef', 'New feature or request'),
+    LabelDef('bug', 'd73a4a', 'Something isn\'t working'),
+    LabelDef('Programming', '0e8a16', 'Programming and technical implementation'),
+    LabelDef('Art', 'fbca04', 'Visual art, graphics, and UI design'),
+    LabelDef('Audio', 'f9d0c4', 'Sound effects and music'),
+    LabelDef('QA', 'ededed', 'Quality assurance, testing, and debugging'),
+    LabelDef('Documentation', '0075ca', 'Documentation and technical writing'),
+    LabelDef('Marketing', 'ff69b4', 'Marketing and promotion'),
+    LabelDef('Business', 'd4c5f9', 'Business operations and analytics'),
+)
+
+# Bullet lines under "Acceptance Criteria:" - leading dashes and spaces are dropped from the criterion
+ACCEPTANCE_CRITERION_PATTERN = re.compile(r'^[^\S\n]*-[- ]*(?![- ])[^\S\n]*(\S.*?)[^\S\n]*$', re.MULTILINE)
+
+# Maximum number of aliased createIssue mutations sent in a single GraphQL request
+ISSUE_BATCH_SIZE = 50
+
+# Concurrent REST requests and rate-limit retries used when creating issues
+MAX_WORKERS = 8
+MAX_RETRIES = 5
+
+# Requests are paced out to the rate-limit reset once fewer than this many remain
+RATE_LIMIT_LOW_WATERMARK = 50
+
+# Stories already created per repository, so a rerun after a failure only creates the rest
+CHECKPOINT_FILE = '.gdppc_done.json'
+
+# On-disk cache of GitHub metadata (repository response, labels and milestones), under XDG_CACHE_HOME
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'gdppc'
+CACHE_TTL_SECONDS = 300
+REPO_STATE_CACHE_KEY = 'graphql:repo_state'
 
 
 class UserStory:
     """Represents a user story to be created as a GitHub issue."""
     
+    # Slots keep per-story memory down when thousands of templates are loaded
+    __slots__ = ('story_id', 'template_title', 'occurrence', 'title', 'description', 'labels', 'acceptance_criteria', 'milestone', '_body')
+    
     def __init__(self, story_id: str, title: str, description: str,
-                 labels: List[str], acceptance_criteria: List[str], milestone: str = None):
+                 labels: List[str], acceptance_criteria: List[str], milestone: str = None,
+                 occurrence: int = 1):
         self.story_id = story_id
+        self.template_title = title
+        self.occurrence = occurrence
         self.title = f"{story_id}: {title}"
         self.description = description
         self.labels = labels if labels else []
         self.acceptance_criteria = acceptance_criteria if acceptance_criteria else []
         self.milestone = milestone
+        self._body = None
     
     def get_body(self) -> str:
-        """Generate the issue body in markdown format."""
-        body_parts = [self.description]
-        
-        if self.acceptance_criteria:
-            body_parts.append("\n**Acceptance Criteria:**")
-            for criterion in self.acceptance_criteria:
-                body_parts.append(f"- {criterion}")
+        """Generate the issue body in markdown format (built once, as stories are not modified after loading)."""
+        if self._body is None:
+            if not self.acceptance_criteria:
+                self._body = self.description
+            else:
+                criteria = "\n".join(f"- {criterion}" for criterion in self.acceptance_criteria)
+                self._body = f"{self.description}\n\n**Acceptance Criteria:**\n{criteria}"
+        return self._body
+    
+    @property
+    def checkpoint_key(self) -> str:
+        """Identify the story across runs by category, template title and occurrence.
         
-        return "\n".join(body_parts)
+        The story ID is left out because it is positional: inserting or reordering a
+        template renumbers every later story in its category. Repeats of a title within a
+        category are told apart by their occurrence number (the first keeps the bare key).
+        """
+        key = f"{self.milestone}/{self.template_title}"
+        return key if self.occurrence == 1 else f"{key}#{self.occurrence}"
+
+
+def write_lines(lines: List[str]):
+    """Write a phase's collected progress lines to stdout in one call."""
+    sys.stdout.write("".join(f"{line}\n" for line in lines))
+    sys.stdout.flush()
 
 
 def validate_inputs(templates_file: str, owner: str, repo: str, token: str) -> bool:
@@ -119,6 +211,55 @@ def validate_inputs(templates_file: str, owner: str, repo: str, token: str) -> b
     return True
 
 
+def parse_template_body(body: str) -> Tuple[str, List[str]]:
+    """Split a template body into its description and "Acceptance Criteria:" bullet points."""
+    description, header, criteria_text = body.partition('Acceptance Criteria:')
+    if not header:
+        return body, []
+    
+    # Only the text up to a repeated header belongs to the criteria list
+    criteria_text = criteria_text.partition('Acceptance Criteria:')[0]
+    
+    # Collect the bullet points with one precompiled regex scan instead of a per-line loop
+    return description.strip(), ACCEPTANCE_CRITERION_PATTERN.findall(criteria_text)
+
+
+def loads_json(data):
+    """Parse JSON text or bytes with orjson when installed, falling back to json for anything it rejects."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def dumps_json(obj) -> bytes:
+    """Serialize an object to UTF-8 encoded JSON with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def iter_template_categories(json_file: str) -> Iterator[Tuple[str, Dict]]:
+    """Yield (category key, category data) pairs from the templates file.
+    
+    With ijson installed the file is streamed, so only one category is held in memory
+    at a time; otherwise the whole file is parsed with json.
+    """
+    try:
+        import ijson
+    except ImportError:
+        # The file is consumed in one shot, so read the raw bytes (no text/buffered wrapper);
+        # non UTF-8 files fall back to json.loads, which detects the UTF encoding itself
+        data = loads_json(Path(json_file).read_bytes())
+        yield from data.get('categories', {}).items()
+        return
+    
+    with open(json_file, 'rb') as f:
+        yield from ijson.kvitems(f, 'categories')
+
+
 def load_issue_templates(json_file: str) -> List[UserStory]:
     """Load issue templates from JSON file.
     
@@ -141,197 +282,404 @@ def load_issue_templates(json_file: str) -> List[UserStory]:
     """
     issues = []
     
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Generate user story ID counter for each category (numbering starts at 1)
+    category_counters = defaultdict(lambda: 1)
     
-    # Generate user story ID counter for each category
-    category_counters = {}
+    # Count repeated titles per category so each story still gets its own checkpoint key
+    title_counts = defaultdict(int)
     
-    # Process each category
-    for category_key, category_data in data.get('categories', {}).items():
+    # Process each category as it is parsed
+    for category_key, category_data in iter_template_categories(json_file):
         category_name = category_data.get('name', category_key)
         templates = category_data.get('templates', [])
         
-        # Initialize counter for this category
-        if category_name not in category_counters:
-            category_counters[category_name] = 1
-        
-        # Map category name to code for story IDs (case-insensitive)
-        category_code_map = {
-            'programming': 'PROG',
-            'art': 'ART',
-            'audio': 'AUDIO',
-            'qa': 'QA',
-            'documentation': 'DOC',
-            'marketing': 'MKT',
-            'business': 'BUS',
-        }
-        category_code = category_code_map.get(category_name.lower(), 'PROG')
+        # Map category name to its story ID prefix once per category (case-insensitive)
+        story_prefix = f"US-{CATEGORY_CODES.get(category_name.lower(), 'PROG')}-"
         
-        # Create UserStory object for each template
-        for template in templates:
-            story_num = category_counters[category_name]
-            story_id = f"US-{category_code}-{story_num:03d}"
+        # Create UserStory object for each template, numbering on from earlier templates of this category
+        for story_num, template in enumerate(templates, start=category_counters[category_name]):
+            story_id = f"{story_prefix}{story_num:03d}"
             
             title = template.get('title', 'Untitled')
             body = template.get('body', '')
             labels = template.get('labels', [])
             
             # Extract acceptance criteria if present in body (after "Acceptance Criteria:" header)
-            acceptance_criteria = []
-            description = body
-            if 'Acceptance Criteria:' in body:
-                parts = body.split('Acceptance Criteria:')
-                description = parts[0].strip()
-                criteria_text = parts[1].strip()
-                # Parse bullet points - first strip, check if starts with -, then remove the -
-                for line in criteria_text.split('\n'):
-                    line_stripped = line.strip()
-                    if line_stripped.startswith('-'):
-                        criterion = line_stripped.lstrip('- ').strip()
-                        if criterion:
-                            acceptance_criteria.append(criterion)
+            description, acceptance_criteria = parse_template_body(body)
             
+            title_counts[(category_name, title)] += 1
             story = UserStory(
                 story_id=story_id,
                 title=title,
                 description=description,
                 labels=labels,
                 acceptance_criteria=acceptance_criteria,
-                milestone=category_name
+                milestone=category_name,
+                occurrence=title_counts[(category_name, title)]
             )
             issues.append(story)
-            
-            category_counters[category_name] += 1
+        
+        category_counters[category_name] += len(templates)
     
     return issues
 
 
-def setup_labels(repo, dry_run: bool = False):
-    """Create or update standard labels."""
-    print("📋 Step 1: Setting up labels")
-    print("-" * 65)
+def create_http_session() -> requests.Session:
+    """Create the session shared by all direct GitHub REST and GraphQL calls.
     
-    if dry_run:
-        print(f"  Would create/update {len(STANDARD_LABELS)} labels:")
-        for label_def in STANDARD_LABELS:
-            print(f"    - {label_def['name']}")
-        print()
+    One session keeps the TLS connection alive between calls. 429 responses (secondary
+    rate limit) are retried honouring Retry-After; server errors and read or protocol
+    errors are not, since a mutation may already have been applied.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=MAX_RETRIES,
+        read=False,
+        status=MAX_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=(429,),
+        allowed_methods=frozenset({'GET', 'POST', 'PATCH'}),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS, max_retries=retry))
+    return session
+
+
+HTTP_SESSION = create_http_session()
+atexit.register(HTTP_SESSION.close)
+
+
+def get_cache_file(owner: str, repo_name: str) -> Path:
+    """Return the path of the response cache file for a repository."""
+    return CACHE_DIR / f"{owner}_{repo_name}.json"
+
+
+def load_response_cache(owner: str, repo_name: str) -> Dict:
+    """Load cached GitHub responses for a repository (empty if missing or unreadable)."""
+    try:
+        return loads_json(get_cache_file(owner, repo_name).read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_response_cache(owner: str, repo_name: str, cache: Dict):
+    """Write cached GitHub responses for a repository; an unwritable cache is skipped."""
+    cache_file = get_cache_file(owner, repo_name)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        temp_file = cache_file.with_suffix('.tmp')
+        temp_file.write_bytes(dumps_json(cache))
+        os.replace(temp_file, cache_file)
+    except OSError:
+        pass
+
+
+def get_repository(token: str, owner: str, repo_name: str, use_cache: bool = True) -> Dict:
+    """GET the repository, revalidating a cached copy with If-None-Match.
+    
+    The request is always made, so a bad or expired token fails here rather than on the
+    first mutation; an unchanged repository costs a 304, which does not count against the
+    rate limit. use_cache=False bypasses the cache entirely.
+    """
+    cache = load_response_cache(owner, repo_name) if use_cache else {}
+    url = f"https://api.github.com/repos/{owner}/{repo_name}"
+    headers = {
+        'Authorization': f'Bearer {token}',
+        'Accept': 'application/vnd.github+json',
+    }
+    
+    entry = cache.get(url)
+    if entry and entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    
+    response = HTTP_SESSION.get(url, headers=headers)
+    if response.status_code == 200:
+        entry = {'etag': response.headers.get('ETag'), 'body': loads_json(response.content)}
+        cache[url] = entry
+        if use_cache:
+            save_response_cache(owner, repo_name, cache)
+    elif response.status_code != 304:
+        raise Exception(f"GET {url} failed: {response.status_code} - {response.text}")
+    
+    return entry['body']
+
+
+def load_checkpoint(owner: str, repo_name: str) -> Dict:
+    """Load what earlier runs recorded for this repository.
+    
+    Returns {'project', 'issues', 'enabled'}: project is the board an earlier run created
+    ({'id', 'field_id', 'options'}) or None, and issues maps a story's checkpoint_key to
+    {'id', 'number', 'in_project'}. enabled is turned off if the file can't be written.
+    """
+    checkpoint = {'project': None, 'issues': {}, 'enabled': True}
+    try:
+        saved = json.loads(Path(CHECKPOINT_FILE).read_bytes()).get(f"{owner}/{repo_name}")
+    except (OSError, ValueError, AttributeError):
+        return checkpoint
+    
+    if isinstance(saved, dict):
+        checkpoint['project'] = saved.get('project')
+        checkpoint['issues'] = saved.get('issues', {})
+    return checkpoint
+
+
+def save_checkpoint(owner: str, repo_name: str, checkpoint: Dict):
+    """Record this repository's checkpoint (atomic rename, other repos preserved).
+    
+    If the file can't be written a warning is printed once and checkpointing is turned off
+    for the rest of the run, which carries on without it.
+    """
+    if not checkpoint['enabled']:
         return
     
-    created = 0
-    updated = 0
+    checkpoint_file = Path(CHECKPOINT_FILE)
+    try:
+        all_checkpoints = json.loads(checkpoint_file.read_bytes())
+    except (OSError, ValueError):
+        all_checkpoints = {}
     
-    for label_def in STANDARD_LABELS:
-        try:
-            try:
-                label = repo.get_label(label_def['name'])
-                label.edit(
-                    name=label_def['name'],
-                    color=label_def['color'],
-                    description=label_def.get('description', '')
-                )
-                print(f"  ✓ Updated label: {label_def['name']}")
-                updated += 1
-            except GithubException as e:
-                if e.status == 404:
-                    repo.create_label(
-                        name=label_def['name'],
-                        color=label_def['color'],
-                        description=label_def.get('description', '')
-                    )
-                    print(f"  ✓ Created label: {label_def['name']}")
-                    created += 1
-                else:
-                    raise
-        except Exception as e:
-            print(f"  ✗ Failed to process label '{label_def['name']}': {str(e)}")
+    all_checkpoints[f"{owner}/{repo_name}"] = {'project': checkpoint['project'], 'issues': checkpoint['issues']}
+    temp_file = checkpoint_file.with_name(checkpoint_file.name + '.tmp')
+    try:
+        temp_file.write_text(json.dumps(all_checkpoints, indent=2), encoding='utf-8')
+        os.replace(temp_file, checkpoint_file)
+    except OSError as e:
+        print(f"  ! Warning: could not write {CHECKPOINT_FILE} ({e}); continuing without a checkpoint")
+        checkpoint['enabled'] = False
+
+
+def find_pending_stories(user_stories: List[UserStory], checkpoint: Dict) -> List[UserStory]:
+    """Return the stories whose issue has not been created, or not yet added to the project board."""
+    issues = checkpoint['issues']
+    return [story for story in user_stories if not issues.get(story.checkpoint_key, {}).get('in_project')]
+
+
+def report_skipped_stories(user_stories: List[UserStory], checkpoint: Dict) -> List[UserStory]:
+    """Drop stories a previous run fully processed, printing how many were skipped."""
+    pending = find_pending_stories(user_stories, checkpoint)
+    skipped = len(user_stories) - len(pending)
+    if skipped:
+        print(f"  ↷ Skipping {skipped} issues already created and added to the project by a previous run (see {CHECKPOINT_FILE})")
+    return pending
+
+
+def apply_label(repo, token: str, labels_url: str, label_def: LabelDef, label: Optional[Dict]) -> Tuple[str, str, Optional[Dict]]:
+    """Create or update one standard label given its current state (None if missing).
     
-    print(f"\n  Labels: {created} created, {updated} updated\n")
+    Returns the outcome ('created', 'updated', 'unchanged' or 'failed'), the progress
+    line to print, and the label's new repo_state entry when it was created or updated.
+    """
+    description = label_def.description
+    try:
+        if label is None:
+            created_label = call_with_retry(
+                repo.create_label,
+                name=label_def.name,
+                color=label_def.color,
+                description=description
+            )
+            label_id = created_label.raw_data['node_id']
+            outcome, message = 'created', f"  ✓ Created label: {label_def.name}"
+        elif (label['name'] == label_def.name
+              and label['color'].lower() == label_def.color.lower()
+              and (label['description'] or '') == description):
+            return 'unchanged', f"  ✓ Label up to date: {label_def.name}", None
+        else:
+            # PATCH the label by its current name, so it isn't fetched again first
+            response = send_github_request('PATCH', f"{labels_url}/{quote(label['name'], safe='')}", token, {
+                'new_name': label_def.name,
+                'color': label_def.color,
+                'description': description,
+            })
+            if response.status_code != 200:
+                raise Exception(f"{response.status_code} - {response.text}")
+            label_id = label['id']
+            outcome, message = 'updated', f"  ✓ Updated label: {label_def.name}"
+    except Exception as e:
+        return 'failed', f"  ✗ Failed to process label '{label_def.name}': {str(e)}", None
+    
+    return outcome, message, {
+        'id': label_id,
+        'name': label_def.name,
+        'color': label_def.color,
+        'description': description,
+    }
 
 
-def setup_milestones(repo, dry_run: bool = False):
-    """Create milestones for each category."""
-    print("🎯 Step 2: Setting up milestones")
-    print("-" * 65)
+def setup_labels(repo, token: str, owner: str, repo_name: str, repo_state: Dict, output: List[str], dry_run: bool = False):
+    """Create or update standard labels, recording new label node IDs in repo_state and progress lines in output."""
+    output.append("📋 Step 1: Setting up labels")
+    output.append("-" * 65)
+    
+    if dry_run:
+        output.append(f"  Would create/update {len(STANDARD_LABELS)} labels:")
+        for label_def in STANDARD_LABELS:
+            output.append(f"    - {label_def.name}")
+        output.append('')
+        return
+    
+    # Existing labels come from fetch_repo_state and are diffed in memory instead of probing
+    # each label (keyed by lowercase name, as label names are case-insensitive on GitHub)
+    existing_labels = repo_state['labels']
+    labels_url = f"https://api.github.com/repos/{owner}/{repo_name}/labels"
+    
+    # Labels are independent of each other, so the create/edit round trips are overlapped.
+    # map() yields results in STANDARD_LABELS order and repo_state is only updated on this thread.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = executor.map(
+            lambda label_def: apply_label(repo, token, labels_url, label_def, existing_labels.get(label_def.name.lower())),
+            STANDARD_LABELS
+        )
+        outcomes = Counter()
+        for label_def, (outcome, message, label) in zip(STANDARD_LABELS, results):
+            output.append(message)
+            outcomes[outcome] += 1
+            if label is not None:
+                existing_labels[label_def.name.lower()] = label
+    
+    output.append(f"\n  Labels: {outcomes['created']} created, {outcomes['updated']} updated, {outcomes['unchanged']} unchanged\n")
+
+
+def setup_milestones(repo, repo_state: Dict, output: List[str], dry_run: bool = False):
+    """Create milestones for each category, recording new milestone node IDs in repo_state and progress lines in output."""
+    output.append("🎯 Step 2: Setting up milestones")
+    output.append("-" * 65)
     
     if dry_run:
-        print(f"  Would create {len(MILESTONES)} milestones:")
+        output.append(f"  Would create {len(MILESTONES)} milestones:")
         for milestone_def in MILESTONES:
-            print(f"    - {milestone_def['title']}: {milestone_def['description']}")
-        print()
+            output.append(f"    - {milestone_def.title}: {milestone_def.description}")
+        output.append('')
         return {}
     
     created = 0
     existing = 0
     
-    # Get existing milestones
-    existing_milestones = {m.title: m for m in repo.get_milestones(state='all')}
+    # Existing milestones come from fetch_repo_state
+    existing_milestones = repo_state['milestones']
     
     for milestone_def in MILESTONES:
-        if milestone_def['title'] in existing_milestones:
-            print(f"  ✓ Milestone exists: {milestone_def['title']}")
+        if milestone_def.title in existing_milestones:
+            output.append(f"  ✓ Milestone exists: {milestone_def.title}")
             existing += 1
         else:
-            repo.create_milestone(
-                title=milestone_def['title'],
-                description=milestone_def['description']
+            # Runs alongside the label writes, so secondary rate limits are backed off like theirs
+            milestone = call_with_retry(
+                repo.create_milestone,
+                title=milestone_def.title,
+                description=milestone_def.description
             )
-            print(f"  ✓ Created milestone: {milestone_def['title']}")
+            existing_milestones[milestone_def.title] = {
+                'id': milestone.raw_data['node_id'],
+                'number': milestone.number,
+                'title': milestone_def.title,
+            }
+            output.append(f"  ✓ Created milestone: {milestone_def.title}")
             created += 1
     
-    print(f"\n  Milestones: {created} created, {existing} existing\n")
+    output.append(f"\n  Milestones: {created} created, {existing} existing\n")
     
-    # Return updated milestone map
-    return {m.title: m for m in repo.get_milestones(state='all')}
+    # Return updated milestone map (newly created milestones were added above, no refetch needed)
+    return existing_milestones
 
 
-def run_graphql_query(token: str, query: str, variables: Dict = None) -> Dict:
-    """Execute a GraphQL query against GitHub API."""
+def rate_limit_delay(headers: Dict, attempt: int) -> float:
+    """Seconds to wait before retrying a rate-limited request, preferring GitHub's own hints."""
+    retry_after = headers.get('retry-after')
+    if retry_after is not None:
+        return int(retry_after)
+    if headers.get('x-ratelimit-remaining') == '0':
+        return max(1, int(headers.get('x-ratelimit-reset', 0)) - int(time.time()))
+    
+    # Jitter keeps concurrent workers from retrying in lockstep
+    return 2 ** attempt + random.random()
+
+
+def call_with_retry(func, *args, **kwargs):
+    """Call a PyGithub method, backing off only when GitHub signals rate-limit pressure."""
+    from github import GithubException
+    
+    for attempt in range(MAX_RETRIES):
+        try:
+            return func(*args, **kwargs)
+        except GithubException as e:
+            headers = e.headers or {}
+            retry_after = headers.get('retry-after')
+            rate_limited = (
+                retry_after is not None
+                or headers.get('x-ratelimit-remaining') == '0'
+                or 'rate limit' in str(e.data).lower()
+            )
+            if e.status not in (403, 429) or not rate_limited or attempt == MAX_RETRIES - 1:
+                raise
+            
+            time.sleep(rate_limit_delay(headers, attempt))
+
+
+def pace_rate_limit(headers: Dict):
+    """Sleep only when the rate-limit budget is nearly spent, spreading what's left until reset."""
+    remaining = headers.get('x-ratelimit-remaining')
+    reset = headers.get('x-ratelimit-reset')
+    if remaining is None or reset is None or int(remaining) >= RATE_LIMIT_LOW_WATERMARK:
+        return
+    
+    # Linear pacing: divide the time left in the window across the remaining requests
+    time.sleep(max(0, int(reset) - time.time()) / max(int(remaining), 1))
+
+
+def send_github_request(method: str, url: str, token: str, payload: Dict) -> requests.Response:
+    """Send a JSON request to the GitHub API, resending it while GitHub rejects it for rate limiting."""
     headers = {
         'Authorization': f'Bearer {token}',
         'Content-Type': 'application/json',
     }
     
+    for attempt in range(MAX_RETRIES):
+        response = HTTP_SESSION.request(method, url, headers=headers, data=dumps_json(payload))
+        
+        # Rate-limited requests are rejected as 403 before anything is applied, so they are
+        # safe to resend once GitHub says so (429s are already retried by the session)
+        if (response.status_code != 403 or 'rate limit' not in response.text.lower()
+                or attempt == MAX_RETRIES - 1):
+            break
+        time.sleep(rate_limit_delay(response.headers, attempt))
+    
+    pace_rate_limit(response.headers)
+    return response
+
+
+def post_graphql_request(token: str, query: str, variables: Dict = None) -> Dict:
+    """Send a GraphQL request to GitHub API and return the full response (data and errors)."""
     payload = {'query': query}
     if variables:
         payload['variables'] = variables
     
-    response = requests.post(
-        'https://api.github.com/graphql',
-        headers=headers,
-        json=payload
-    )
-    
+    response = send_github_request('POST', 'https://api.github.com/graphql', token, payload)
     if response.status_code != 200:
         raise Exception(f"GraphQL query failed: {response.status_code} - {response.text}")
     
-    result = response.json()
+    return loads_json(response.content)
+
+
+def run_graphql_query(token: str, query: str, variables: Dict = None) -> Dict:
+    """Execute a GraphQL query against GitHub API."""
+    result = post_graphql_request(token, query, variables)
     if 'errors' in result:
         raise Exception(f"GraphQL errors: {json.dumps(result['errors'], indent=2)}")
     
     return result['data']
 
 
-def setup_project_v2(repo, token: str, owner: str, repo_name: str, dry_run: bool = False):
-    """Create or find ProjectV2 board with Kanban workflow columns using GraphQL."""
-    print("📊 Step 3: Setting up project board (Projects V2)")
-    print("-" * 65)
-    
-    project_name = f"{repo_name} Project Plan"
-    
-    if dry_run:
-        print(f"  Would create ProjectV2 board: '{project_name}'")
-        print(f"  Would create {len(PROJECT_COLUMNS)} workflow columns with colors and WIP limits:")
-        for col_def in PROJECT_COLUMNS:
-            limit_info = f", WIP limit: {col_def['limit']}" if 'limit' in col_def else ", no WIP limit"
-            print(f"    - {col_def['name']} ({col_def['color']}{limit_info})")
-        print()
-        return None, None, None
+def fetch_repo_state(token: str, owner: str, repo_name: str) -> Dict:
+    """Fetch the repository node ID, visibility, owner, labels, and milestones in one GraphQL query.
     
-    # Get repository node ID and visibility
-    query_repo_id = """
-    query($owner: String!, $repo: String!) {
+    Returns {'id', 'is_private', 'owner_id', 'labels', 'milestones'} where labels are keyed by lowercase name and
+    milestones by title. Connections with more than 100 entries are paged with the same
+    query, skipping whichever connection is already complete.
+    """
+    query_state = """
+    query($owner: String!, $repo: String!, $withLabels: Boolean!, $labelsCursor: String, $withMilestones: Boolean!, $milestonesCursor: String) {
       repository(owner: $owner, name: $repo) {
         id
         isPrivate
@@ -343,18 +691,245 @@ def setup_project_v2(repo, token: str, owner: str, repo_name: str, dry_run: bool
             id
           }
         }
+        labels(first: 100, after: $labelsCursor) @include(if: $withLabels) {
+          nodes {
+            id
+            name
+            color
+            description
+          }
+          pageInfo {
+            hasNextPage
+            endCursor
+          }
+        }
+        milestones(first: 100, after: $milestonesCursor, states: [OPEN, CLOSED]) @include(if: $withMilestones) {
+          nodes {
+            id
+            number
+            title
+          }
+          pageInfo {
+            hasNextPage
+            endCursor
+          }
+        }
       }
     }
     """
     
-    repo_data = run_graphql_query(token, query_repo_id, {
+    repo_state = {'id': None, 'is_private': False, 'owner_id': None, 'labels': {}, 'milestones': {}}
+    variables = {
         'owner': owner,
-        'repo': repo_name
-    })
+        'repo': repo_name,
+        'withLabels': True,
+        'labelsCursor': None,
+        'withMilestones': True,
+        'milestonesCursor': None,
+    }
+    
+    while variables['withLabels'] or variables['withMilestones']:
+        repo_data = run_graphql_query(token, query_state, variables)['repository']
+        repo_state['id'] = repo_data['id']
+        repo_state['is_private'] = repo_data['isPrivate']
+        repo_state['owner_id'] = repo_data['owner']['id']
+        
+        if variables['withLabels']:
+            for label in repo_data['labels']['nodes']:
+                repo_state['labels'][label['name'].lower()] = label
+            variables['withLabels'] = repo_data['labels']['pageInfo']['hasNextPage']
+            variables['labelsCursor'] = repo_data['labels']['pageInfo']['endCursor']
+        
+        if variables['withMilestones']:
+            for milestone in repo_data['milestones']['nodes']:
+                repo_state['milestones'][milestone['title']] = milestone
+            variables['withMilestones'] = repo_data['milestones']['pageInfo']['hasNextPage']
+            variables['milestonesCursor'] = repo_data['milestones']['pageInfo']['endCursor']
+    
+    return repo_state
+
+
+def run_batched_mutation(token: str, mutation: str, input_type: str, selection: str, inputs: List[Dict], alias: str) -> Tuple[Dict[int, Dict], Dict[int, str]]:
+    """Run one mutation per input in a single GraphQL request, using aliases {alias}0, {alias}1, ...
     
-    repo_id = repo_data['repository']['id']
-    owner_id = repo_data['repository']['owner']['id']
-    repo_is_private = repo_data['repository']['isPrivate']
+    Returns a map of input index to mutation payload and a map of input index to error
+    message for the inputs that failed; errors are reported per alias, so one bad input
+    does not fail the whole batch.
+    """
+    if not inputs:
+        return {}, {}
+    
+    declarations = [f"$input{index}: {input_type}!" for index in range(len(inputs))]
+    mutations = [
+        f"  {alias}{index}: {mutation}(input: $input{index}) {{ {selection} }}"
+        for index in range(len(inputs))
+    ]
+    variables = {f"input{index}": mutation_input for index, mutation_input in enumerate(inputs)}
+    
+    document = f"mutation({', '.join(declarations)}) {{\n" + "\n".join(mutations) + "\n}"
+    
+    result = post_graphql_request(token, document, variables)
+    data = result.get('data') or {}
+    
+    errors = {}
+    for error in result.get('errors', []):
+        path = error.get('path') or []
+        if path and str(path[0]).startswith(alias) and str(path[0])[len(alias):].isdigit():
+            errors[int(path[0][len(alias):])] = error.get('message', 'Unknown error')
+    
+    payloads = {}
+    for index in range(len(inputs)):
+        payload = data.get(f"{alias}{index}")
+        if payload and index not in errors:
+            payloads[index] = payload
+        elif index not in errors:
+            errors[index] = 'Mutation returned no result'
+    
+    return payloads, errors
+
+
+def load_repo_state(token: str, owner: str, repo_name: str, refresh: bool = False) -> Dict:
+    """Return the repository state from the response cache while fresh, else fetch it.
+    
+    The cached copy is dropped as it is handed out, because setup is about to change the
+    repository; save_repo_state caches the updated state once the run has finished.
+    """
+    cache = load_response_cache(owner, repo_name)
+    entry = cache.pop(REPO_STATE_CACHE_KEY, None)
+    if entry and not refresh and time.time() - entry['fetched_at'] < CACHE_TTL_SECONDS:
+        repo_state = entry['body']
+    else:
+        repo_state = fetch_repo_state(token, owner, repo_name)
+    
+    if entry:
+        save_response_cache(owner, repo_name, cache)
+    return repo_state
+
+
+def save_repo_state(owner: str, repo_name: str, repo_state: Dict):
+    """Cache the repository state (including labels and milestones created by this run)."""
+    cache = load_response_cache(owner, repo_name)
+    cache[REPO_STATE_CACHE_KEY] = {'fetched_at': time.time(), 'body': repo_state}
+    save_response_cache(owner, repo_name, cache)
+
+
+def create_issues_batch(token: str, stories: List[UserStory], repo_state: Dict) -> Tuple[Dict[int, Dict], Dict[int, str]]:
+    """Create several issues with a single GraphQL request using one aliased createIssue per story.
+    
+    Returns a map of story index to created issue ({'id', 'number'}) and a map of
+    story index to error message for the stories that could not be created.
+    """
+    issue_inputs = []
+    for story in stories:
+        issue_input = {
+            'repositoryId': repo_state['id'],
+            'title': story.title,
+            'body': story.get_body(),
+            'labelIds': [
+                repo_state['labels'][name.lower()]['id']
+                for name in story.labels if name.lower() in repo_state['labels']
+            ],
+        }
+        milestone = repo_state['milestones'].get(story.milestone)
+        if milestone:
+            issue_input['milestoneId'] = milestone['id']
+        issue_inputs.append(issue_input)
+    
+    payloads, errors = run_batched_mutation(
+        token, 'createIssue', 'CreateIssueInput', 'issue { id number }', issue_inputs, alias='i'
+    )
+    
+    created = {}
+    for index, payload in payloads.items():
+        if payload.get('issue'):
+            created[index] = payload['issue']
+        else:
+            errors[index] = 'Issue was not created'
+    
+    return created, errors
+
+
+def add_issues_to_project(token: str, issue_ids: Dict[int, str], project_id: str, field_id: str, backlog_option_id: str) -> Tuple[Dict[int, str], Dict[int, str]]:
+    """Add issues to the ProjectV2 board in the Backlog column with two batched GraphQL requests.
+    
+    issue_ids maps a story index to the issue node ID. Returns a map of story index to the
+    progress line to print and a map of story index to error message.
+    """
+    if not (project_id and backlog_option_id) or not issue_ids:
+        return {}, {}
+    
+    indices = list(issue_ids)
+    added, add_errors = run_batched_mutation(
+        token, 'addProjectV2ItemById', 'AddProjectV2ItemByIdInput', 'item { id }',
+        [{'projectId': project_id, 'contentId': issue_ids[index]} for index in indices],
+        alias='a'
+    )
+    errors = {indices[position]: message for position, message in add_errors.items()}
+    
+    # Set the Status field value to Backlog for the newly added items (needs their item IDs)
+    added_positions = sorted(added)
+    if not field_id:
+        return {indices[position]: "    → Added to project" for position in added_positions}, errors
+    
+    _, status_errors = run_batched_mutation(
+        token, 'updateProjectV2ItemFieldValue', 'UpdateProjectV2ItemFieldValueInput', 'projectV2Item { id }',
+        [
+            {
+                'projectId': project_id,
+                'itemId': added[position]['item']['id'],
+                'fieldId': field_id,
+                'value': {'singleSelectOptionId': backlog_option_id},
+            }
+            for position in added_positions
+        ],
+        alias='s'
+    )
+    
+    messages = {}
+    for status_position, position in enumerate(added_positions):
+        if status_position in status_errors:
+            errors[indices[position]] = status_errors[status_position]
+        else:
+            messages[indices[position]] = "    → Added to project with Backlog status"
+    
+    return messages, errors
+
+
+def setup_project_v2(repo, token: str, owner: str, repo_name: str, repo_state: Dict, output: List[str],
+                     saved_project: Optional[Dict] = None, pending: bool = True, dry_run: bool = False):
+    """Create or find ProjectV2 board with Kanban workflow columns using GraphQL (progress lines go to output).
+    
+    saved_project is the board a previous run created, which is reused rather than creating
+    a second one; with nothing pending from a previous run no board is created at all.
+    """
+    output.append("📊 Step 3: Setting up project board (Projects V2)")
+    output.append("-" * 65)
+    
+    project_name = f"{repo_name} Project Plan"
+    
+    if dry_run:
+        output.append(f"  Would create ProjectV2 board: '{project_name}'")
+        output.append(f"  Would create {len(PROJECT_COLUMNS)} workflow columns with colors and WIP limits:")
+        for col_def in PROJECT_COLUMNS:
+            limit_info = f", WIP limit: {col_def.limit}" if col_def.limit is not None else ", no WIP limit"
+            output.append(f"    - {col_def.name} ({col_def.color}{limit_info})")
+        output.append('')
+        return None, None, None
+    
+    if saved_project:
+        output.append(f"  ✓ Using the ProjectV2 board created by a previous run (see {CHECKPOINT_FILE})")
+        output.append('')
+        return saved_project['id'], saved_project['field_id'], saved_project['options']
+    
+    if not pending:
+        output.append("  ✓ Every issue was created and added to the project by a previous run")
+        output.append('')
+        return None, None, {}
+    
+    # Repository node ID, owner, and visibility were already fetched with the labels and milestones
+    repo_id = repo_state['id']
+    owner_id = repo_state['owner_id']
+    repo_is_private = repo_state['is_private']
     repo_visibility = "private" if repo_is_private else "public"
     
     # Check if project already exists at owner level
@@ -371,6 +946,18 @@ def setup_project_v2(repo, token: str, owner: str, repo_name: str, dry_run: bool
               id
               title
               number
+              fields(first: 20) {
+                nodes {
+                  ... on ProjectV2SingleSelectField {
+                    id
+                    name
+                    options {
+                      id
+                      name
+                    }
+                  }
+                }
+              }
             }
           }
         }
@@ -381,30 +968,20 @@ def setup_project_v2(repo, token: str, owner: str, repo_name: str, dry_run: bool
             'title': project_name
         })
         
+        project_fields = create_result['createProjectV2']['projectV2']['fields']['nodes']
         project_id = create_result['createProjectV2']['projectV2']['id']
         project_number = create_result['createProjectV2']['projectV2']['number']
-        print(f"  ✓ Created ProjectV2: '{project_name}' (#{project_number})")
+        output.append(f"  ✓ Created ProjectV2: '{project_name}' (#{project_number})")
         
-        # Link project to repository
-        mutation_link = """
-        mutation($projectId: ID!, $repositoryId: ID!) {
+        # Link project to repository and set its visibility to match the repository.
+        # Both only need the new project ID, so they share one request.
+        mutation_link_and_visibility = """
+        mutation($projectId: ID!, $repositoryId: ID!, $isPublic: Boolean!) {
           linkProjectV2ToRepository(input: {projectId: $projectId, repositoryId: $repositoryId}) {
             repository {
               id
             }
           }
-        }
-        """
-        
-        run_graphql_query(token, mutation_link, {
-            'projectId': project_id,
-            'repositoryId': repo_id
-        })
-        print(f"  ✓ Linked project to repository")
-        
-        # Set project visibility to match repository
-        mutation_set_visibility = """
-        mutation($projectId: ID!, $isPublic: Boolean!) {
           updateProjectV2(input: {projectId: $projectId, public: $isPublic}) {
             projectV2 {
               id
@@ -414,52 +991,31 @@ def setup_project_v2(repo, token: str, owner: str, repo_name: str, dry_run: bool
         }
         """
         
-        run_graphql_query(token, mutation_set_visibility, {
+        run_graphql_query(token, mutation_link_and_visibility, {
             'projectId': project_id,
+            'repositoryId': repo_id,
             'isPublic': not repo_is_private
         })
-        print(f"  ✓ Set project visibility to {repo_visibility} (matching repository)")
+        output.append(f"  ✓ Linked project to repository")
+        output.append(f"  ✓ Set project visibility to {repo_visibility} (matching repository)")
         
     except Exception as e:
         # If project creation fails, continue with other setup steps
         # Projects can be created manually in GitHub UI if needed
         error_msg = str(e)
-        print(f"  ! Warning: Could not create project: {error_msg}")
-        print(f"  ! This may be due to:")
-        print(f"     - Project with this name already exists")
-        print(f"     - Insufficient token permissions (need 'project' scope)")
-        print(f"  ! Continuing with labels, milestones, and issues setup...")
+        output.append(f"  ! Warning: Could not create project: {error_msg}")
+        output.append(f"  ! This may be due to:")
+        output.append(f"     - Project with this name already exists")
+        output.append(f"     - Insufficient token permissions (need 'project' scope)")
+        output.append(f"  ! Continuing with labels, milestones, and issues setup...")
     
-    # Get existing fields (we need the Status field)
+    # Existing fields (we need the Status field) came back with the createProjectV2 response
     if project_id:
-        query_fields = """
-        query($projectId: ID!) {
-          node(id: $projectId) {
-            ... on ProjectV2 {
-              fields(first: 20) {
-                nodes {
-                  ... on ProjectV2SingleSelectField {
-                    id
-                    name
-                    options {
-                      id
-                      name
-                    }
-                  }
-                }
-              }
-            }
-          }
-        }
-        """
-        
-        fields_data = run_graphql_query(token, query_fields, {'projectId': project_id})
-        
         # Find the existing Status field (GitHub creates one by default)
         status_field_id = None
         existing_options = {}
         
-        for field in fields_data['node']['fields']['nodes']:
+        for field in project_fields:
             if field and field.get('name') == 'Status':
                 status_field_id = field['id']
                 for opt in field.get('options', []):
@@ -477,9 +1033,9 @@ def setup_project_v2(repo, token: str, owner: str, repo_name: str, dry_run: bool
             status_options_list = []
             for col_def in PROJECT_COLUMNS:
                 status_options_list.append({
-                    'name': col_def['name'],
-                    'color': col_def['color'],
-                    'description': col_def['description']
+                    'name': col_def.name,
+                    'color': col_def.color,
+                    'description': col_def.description
                 })
             
             # Use updateProjectV2Field to replace options on the existing Status field
@@ -512,18 +1068,18 @@ def setup_project_v2(repo, token: str, owner: str, repo_name: str, dry_run: bool
             for option in field_result['updateProjectV2Field']['projectV2Field']['options']:
                 option_map[option['name']] = option['id']
             
-            print(f"  ✓ Updated Status field with {len(PROJECT_COLUMNS)} workflow options")
-            color_list = ', '.join([f"{c['name']} ({c['color'].lower()})" for c in PROJECT_COLUMNS])
-            print(f"  ✓ Automatically set colors: {color_list}")
+            output.append(f"  ✓ Updated Status field with {len(PROJECT_COLUMNS)} workflow options")
+            color_list = ', '.join([f"{c.name} ({c.color.lower()})" for c in PROJECT_COLUMNS])
+            output.append(f"  ✓ Automatically set colors: {color_list}")
         
         elif not status_field_id:
             # No Status field at all — create one (unlikely but handle it)
             status_options_list = []
             for col_def in PROJECT_COLUMNS:
                 status_options_list.append({
-                    'name': col_def['name'],
-                    'color': col_def['color'],
-                    'description': col_def['description']
+                    'name': col_def.name,
+                    'color': col_def.color,
+                    'description': col_def.description
                 })
             
             mutation_create_field = """
@@ -559,30 +1115,30 @@ def setup_project_v2(repo, token: str, owner: str, repo_name: str, dry_run: bool
             for option in field_result['createProjectV2Field']['projectV2Field']['options']:
                 option_map[option['name']] = option['id']
             
-            print(f"  ✓ Created Status field with {len(PROJECT_COLUMNS)} workflow options")
-            color_list = ', '.join([f"{c['name']} ({c['color'].lower()})" for c in PROJECT_COLUMNS])
-            print(f"  ✓ Automatically set colors: {color_list}")
+            output.append(f"  ✓ Created Status field with {len(PROJECT_COLUMNS)} workflow options")
+            color_list = ', '.join([f"{c.name} ({c.color.lower()})" for c in PROJECT_COLUMNS])
+            output.append(f"  ✓ Automatically set colors: {color_list}")
         else:
             # Field exists with our custom options already
             for col_name in existing_options:
                 option_map[col_name] = existing_options[col_name]
-            print(f"  ✓ Status field already exists with {len(existing_options)} options")
+            output.append(f"  ✓ Status field already exists with {len(existing_options)} options")
         
         if not dry_run:
-            print(f"  ⚠️  Note: WIP limits must still be set manually in GitHub UI:")
+            output.append(f"  ⚠️  Note: WIP limits must still be set manually in GitHub UI:")
             for col_def in PROJECT_COLUMNS:
-                if 'limit' in col_def:
-                    print(f"     - {col_def['name']}: max {col_def['limit']}")
-            print(f"  ⚠️  Note: Default view name 'View 1' and board layout must be configured manually in GitHub UI")
-            print()
+                if col_def.limit is not None:
+                    output.append(f"     - {col_def.name}: max {col_def.limit}")
+            output.append(f"  ⚠️  Note: Default view name 'View 1' and board layout must be configured manually in GitHub UI")
+            output.append('')
         else:
-            print()
+            output.append('')
         
         return project_id, status_field_id, option_map
     else:
         # Project creation failed, return None
-        print(f"  ! Project board setup skipped")
-        print()
+        output.append(f"  ! Project board setup skipped")
+        output.append('')
         return None, None, {}
 
 
@@ -600,7 +1156,7 @@ def setup_project(repo, milestone_map: Dict, dry_run: bool = False):
         print(f"  Visibility would match repository ({'private' if hasattr(repo, 'private') and repo.private else 'public'})")
         print(f"  Would create {len(PROJECT_COLUMNS)} workflow columns:")
         for col_def in PROJECT_COLUMNS:
-            print(f"    - {col_def['name']}: {col_def['description']}")
+            print(f"    - {col_def.name}: {col_def.description}")
         print()
         return None
     
@@ -628,7 +1184,7 @@ def setup_project(repo, milestone_map: Dict, dry_run: bool = False):
     # Create workflow columns (in order)
     created_cols = 0
     for col_def in PROJECT_COLUMNS:
-        col_name = col_def['name']
+        col_name = col_def.name
         if col_name not in existing_columns:
             # Note: GitHub API doesn't support setting column colors or WIP limits via REST API
             # These need to be set manually in the GitHub UI after creation
@@ -654,8 +1210,12 @@ def setup_project(repo, milestone_map: Dict, dry_run: bool = False):
 
 
 
-def create_issues_v2(repo, user_stories: List[UserStory], milestone_map: Dict, project_id: str, field_id: str, status_options: Dict, token: str, dry_run: bool = False):
-    """Create issues from user stories, assign to milestones, and add to ProjectV2 with Backlog status."""
+def create_issues_v2(repo, token: str, owner: str, repo_name: str, repo_state: Dict, user_stories: List[UserStory], project_id: str, field_id: str, status_options: Dict, checkpoint: Dict, dry_run: bool = False):
+    """Create issues from user stories, assign to milestones, and add to ProjectV2 with Backlog status.
+    
+    Progress is recorded in checkpoint, so a rerun neither recreates issues nor skips the
+    project step for issues that were created but not added to the board.
+    """
     print("📝 Step 4: Creating issues and adding to project")
     print("-" * 65)
     
@@ -665,105 +1225,127 @@ def create_issues_v2(repo, user_stories: List[UserStory], milestone_map: Dict, p
     # Get the Backlog option ID
     backlog_option_id = status_options.get('Backlog') if status_options else None
     
-    for story in user_stories:
+    if dry_run:
+        # The preview is several lines per story, so collect it and write it to stdout in one go
+        preview = []
+        for story in user_stories:
+            preview.append(f"  Would create: {story.title}")
+            preview.append(f"    Labels: {', '.join(story.labels)}")
+            preview.append(f"    Milestone: {story.milestone}")
+            preview.append(f"    Project status: Backlog")
+            preview.append(f"    Criteria: {len(story.acceptance_criteria)} items")
+            successful += 1
+        
+        preview.append(f"\n  Issues: {successful} created, {failed} failed")
+        preview.append('')
+        write_lines(preview)
+        return successful, failed
+    
+    from github import GithubException
+    
+    # Labels that don't exist yet are created up front (REST issue creation used to do this implicitly)
+    missing_labels = sorted({
+        name for story in user_stories for name in story.labels
+        if name.lower() not in repo_state['labels']
+    })
+    for label_name in missing_labels:
         try:
-            if dry_run:
-                print(f"  Would create: {story.title}")
-                print(f"    Labels: {', '.join(story.labels)}")
-                print(f"    Milestone: {story.milestone}")
-                print(f"    Project status: Backlog")
-                print(f"    Criteria: {len(story.acceptance_criteria)} items")
-                successful += 1
-            else:
-                # Get milestone object
-                milestone_obj = milestone_map.get(story.milestone)
-                
-                # Create the issue using REST API
-                issue = repo.create_issue(
-                    title=story.title,
-                    body=story.get_body(),
-                    labels=story.labels,
-                    milestone=milestone_obj
-                )
-                print(f"  ✓ Created #{issue.number}: {story.title}")
-                
-                # Add issue to ProjectV2 using GraphQL
-                if project_id and backlog_option_id:
-                    # Get issue node ID
-                    query_issue_id = """
-                    query($owner: String!, $repo: String!, $number: Int!) {
-                      repository(owner: $owner, name: $repo) {
-                        issue(number: $number) {
-                          id
-                        }
-                      }
-                    }
-                    """
-                    
-                    issue_data = run_graphql_query(token, query_issue_id, {
-                        'owner': repo.owner.login,
-                        'repo': repo.name,
-                        'number': issue.number
-                    })
-                    
-                    issue_node_id = issue_data['repository']['issue']['id']
-                    
-                    # Add item to project
-                    mutation_add_item = """
-                    mutation($projectId: ID!, $contentId: ID!) {
-                      addProjectV2ItemById(input: {projectId: $projectId, contentId: $contentId}) {
-                        item {
-                          id
-                        }
-                      }
-                    }
-                    """
-                    
-                    add_result = run_graphql_query(token, mutation_add_item, {
-                        'projectId': project_id,
-                        'contentId': issue_node_id
-                    })
-                    
-                    newly_added_item_id = add_result['addProjectV2ItemById']['item']['id']
-                    
-                    # Set the Status field value to Backlog for the newly added item
-                    if backlog_option_id and field_id:
-                        status_update_mutation = """
-                        mutation($projectId: ID!, $itemId: ID!, $fieldId: ID!, $optionId: String!) {
-                          updateProjectV2ItemFieldValue(input: {
-                            projectId: $projectId,
-                            itemId: $itemId,
-                            fieldId: $fieldId,
-                            value: {singleSelectOptionId: $optionId}
-                          }) {
-                            projectV2Item {
-                              id
-                            }
-                          }
-                        }
-                        """
-                        
-                        run_graphql_query(token, status_update_mutation, {
-                            'projectId': project_id,
-                            'itemId': newly_added_item_id,
-                            'fieldId': field_id,
-                            'optionId': backlog_option_id
-                        })
-                        print(f"    → Added to project with Backlog status")
-                    else:
-                        print(f"    → Added to project")
-                
-                successful += 1
-                
-                # Rate limiting
-                time.sleep(0.5)
+            label = call_with_retry(repo.create_label, name=label_name, color='ededed')
+            repo_state['labels'][label_name.lower()] = {
+                'id': label.raw_data['node_id'],
+                'name': label_name,
+                'color': 'ededed',
+                'description': None,
+            }
+            print(f"  ✓ Created label: {label_name}")
+        except GithubException as e:
+            print(f"  ✗ Failed to create label '{label_name}': {str(e)}")
+    
+    # Names that still can't be resolved are dropped locally (warned once) rather than failing each issue
+    unresolved_labels = [name for name in missing_labels if name.lower() not in repo_state['labels']]
+    if unresolved_labels:
+        print(f"  ! Warning: issues will be created without these labels: {', '.join(unresolved_labels)}")
+    
+    # Skip stories a previous (interrupted) run already created and added to the project
+    recorded = checkpoint['issues']
+    pending_stories = report_skipped_stories(user_stories, checkpoint)
+    added_to_project = 0
+    
+    for start in range(0, len(pending_stories), ISSUE_BATCH_SIZE):
+        batch = pending_stories[start:start + ISSUE_BATCH_SIZE]
+        
+        # Stories whose issue a previous run created only still need adding to the project
+        new_indices = [index for index, story in enumerate(batch) if story.checkpoint_key not in recorded]
+        try:
+            created, create_errors = create_issues_batch(token, [batch[index] for index in new_indices], repo_state)
         except Exception as e:
-            print(f"  ✗ Failed: {story.title} - {str(e)}")
-            failed += 1
+            created, create_errors = {}, {position: str(e) for position in range(len(new_indices))}
+        errors = {new_indices[position]: message for position, message in create_errors.items()}
+        created_indices = {new_indices[position] for position in created}
+        
+        # This batch's issues by index: those recorded by an earlier run plus those just created
+        batch_issues = {
+            index: recorded[story.checkpoint_key]
+            for index, story in enumerate(batch) if index not in new_indices
+        }
+        for position, issue in created.items():
+            batch_issues[new_indices[position]] = {
+                'id': issue['id'],
+                'number': issue['number'],
+                'in_project': False,
+            }
+        
+        # Checkpoint as soon as the issues exist, even if adding them to the project fails below
+        for index in created_indices:
+            recorded[batch[index].checkpoint_key] = batch_issues[index]
+        if created:
+            save_checkpoint(owner, repo_name, checkpoint)
+        
+        # The whole batch is added to the project and moved to Backlog with two more requests
+        issue_ids = {index: issue['id'] for index, issue in batch_issues.items()}
+        try:
+            project_messages, project_errors = add_issues_to_project(
+                token,
+                issue_ids,
+                project_id,
+                field_id,
+                backlog_option_id
+            )
+        except Exception as e:
+            project_messages = {}
+            project_errors = {index: str(e) for index in issue_ids}
+        
+        # Only issues that made it onto the board are done; the rest are retried by the next run
+        for index in project_messages:
+            batch_issues[index]['in_project'] = True
+        if project_messages:
+            save_checkpoint(owner, repo_name, checkpoint)
+        added_to_project += len(project_messages)
+        
+        for index, story in enumerate(batch):
+            if index in errors:
+                print(f"  ✗ Failed: {story.title} - {errors[index]}")
+                failed += 1
+                continue
+            
+            issue = batch_issues[index]
+            if index in created_indices:
+                print(f"  ✓ Created #{issue['number']}: {story.title}")
+            else:
+                print(f"  ↷ Already created #{issue['number']}: {story.title}")
+            
+            if index in project_errors:
+                print(f"  ✗ Failed: {story.title} - {project_errors[index]}")
+                failed += 1
+                continue
+            
+            if index in project_messages:
+                print(project_messages[index])
+            successful += 1
     
     print(f"\n  Issues: {successful} created, {failed} failed")
-    if project_id and not dry_run:
-        print(f"  All issues added to ProjectV2 with Backlog status\n")
+    if added_to_project:
+        print(f"  {added_to_project} issues added to ProjectV2 with Backlog status\n")
     else:
         print()
     return successful, failed
@@ -857,6 +1439,16 @@ def main():
         action='store_true',
         help='Preview changes without creating anything'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not read or write the local GitHub metadata cache'
+    )
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Ignore cached GitHub metadata and fetch it again (the cache is still updated)'
+    )
     
     args = parser.parse_args()
     
@@ -880,15 +1472,18 @@ def main():
     # Connect to GitHub
     if not args.dry_run:
         print(f"Connecting to GitHub repository: {args.owner}/{args.repo}")
-        g = Github(token)
         try:
-            repo = g.get_repo(f"{args.owner}/{args.repo}")
-            print(f"✓ Connected to {repo.full_name}")
-            print(f"  Repository is: {'private' if repo.private else 'public'}")
+            repo_info = get_repository(token, args.owner, args.repo, use_cache=not args.no_cache)
+            print(f"✓ Connected to {repo_info['full_name']}")
+            print(f"  Repository is: {'private' if repo_info['private'] else 'public'}")
             print()
-        except GithubException as e:
+        except Exception as e:
             print(f"❌ Error accessing repository: {e}")
             sys.exit(1)
+        
+        # Repository details come from the cached response above, so no eager fetch is needed
+        from github import Github
+        repo = Github(token).get_repo(f"{args.owner}/{args.repo}", lazy=True)
     else:
         print(f"Would connect to: {args.owner}/{args.repo}\n")
         repo = None
@@ -909,17 +1504,13 @@ def main():
         print('}')
         sys.exit(1)
     
-    print(f"✓ Loaded {len(user_stories)} issue templates")
+    # Show summary by category, written in one call ahead of the confirmation prompt
+    categories = Counter(story.milestone for story in user_stories)
     
-    # Show summary by category
-    categories = {}
-    for story in user_stories:
-        categories[story.milestone] = categories.get(story.milestone, 0) + 1
-    
-    print("\n  By category:")
-    for category in sorted(categories.keys()):
-        print(f"    - {category}: {categories[category]}")
-    print()
+    summary = [f"✓ Loaded {len(user_stories)} issue templates", "\n  By category:"]
+    summary.extend(f"    - {category}: {count}" for category, count in sorted(categories.items()))
+    summary.append('')
+    write_lines(summary)
     
     # Confirm if not dry run
     if not args.dry_run:
@@ -931,33 +1522,79 @@ def main():
     
     # Execute setup steps
     if not args.dry_run:
-        setup_labels(repo, dry_run=False)
-        milestone_map = setup_milestones(repo, dry_run=False)
-        proj_id, stat_field_id, stat_opts = setup_project_v2(repo, token, args.owner, args.repo, dry_run=False)
-        successful, failed = create_issues_v2(repo, user_stories, milestone_map, proj_id, stat_field_id, stat_opts, token, dry_run=False)
+        # Labels and milestones are listed together (or reused from the cache), then shared by every step below
+        if args.no_cache:
+            repo_state = fetch_repo_state(token, args.owner, args.repo)
+        else:
+            repo_state = load_repo_state(token, args.owner, args.repo, refresh=args.refresh)
+        
+        # A rerun reuses the board the previous run created and only needs one if stories remain
+        checkpoint = load_checkpoint(args.owner, args.repo)
+        pending = bool(find_pending_stories(user_stories, checkpoint))
+        
+        # Labels, milestones and the project board don't depend on each other, so their API calls
+        # overlap; each step's output is held back and printed in step order once it finishes
+        step_outputs = [[], [], []]
+        with ThreadPoolExecutor(max_workers=len(step_outputs)) as executor:
+            steps = [
+                executor.submit(setup_labels, repo, token, args.owner, args.repo, repo_state, step_outputs[0], dry_run=False),
+                executor.submit(setup_milestones, repo, repo_state, step_outputs[1], dry_run=False),
+                executor.submit(setup_project_v2, repo, token, args.owner, args.repo, repo_state, step_outputs[2],
+                                saved_project=checkpoint['project'], pending=pending, dry_run=False),
+            ]
+            # Every step's output is written (in order) before the first failure is re-raised
+            step_results = []
+            step_error = None
+            for step, output in zip(steps, step_outputs):
+                try:
+                    step_results.append(step.result())
+                except Exception as e:
+                    step_results.append(None)
+                    step_error = step_error or e
+                write_lines(output)
+        proj_id, stat_field_id, stat_opts = step_results[2] or (None, None, {})
+        
+        # Save a newly created board before any issues (and even if another step failed),
+        # so a rerun adds everything to this board instead of creating another
+        if proj_id and not checkpoint['project']:
+            checkpoint['project'] = {'id': proj_id, 'field_id': stat_field_id, 'options': stat_opts}
+            save_checkpoint(args.owner, args.repo, checkpoint)
+        if step_error:
+            raise step_error
+        
+        successful, failed = create_issues_v2(repo, token, args.owner, args.repo, repo_state, user_stories, proj_id, stat_field_id, stat_opts, checkpoint, dry_run=False)
+        if not args.no_cache:
+            save_repo_state(args.owner, args.repo, repo_state)
     else:
-        setup_labels(None, dry_run=True)
-        milestone_map = setup_milestones(None, dry_run=True)
-        proj_id, stat_field_id, stat_opts = setup_project_v2(None, None, args.owner, args.repo, dry_run=True)
-        successful, failed = create_issues_v2(None, user_stories, {}, None, None, None, None, dry_run=True)
-    
-    # Print final summary
-    print("=" * 65)
-    print("✅ Setup Complete!" if not args.dry_run else "✅ Dry Run Complete!")
-    print("=" * 65)
-    print(f"  User stories processed: {successful}")
-    print(f"  Failures: {failed}")
-    print(f"  Total: {len(user_stories)}")
+        preview = []
+        setup_labels(None, None, args.owner, args.repo, None, preview, dry_run=True)
+        setup_milestones(None, None, preview, dry_run=True)
+        proj_id, stat_field_id, stat_opts = setup_project_v2(None, None, args.owner, args.repo, None, preview, dry_run=True)
+        write_lines(preview)
+        successful, failed = create_issues_v2(None, None, args.owner, args.repo, None, user_stories, None, None, None, None, dry_run=True)
+    
+    # Print final summary in a single write
+    summary = [
+        "=" * 65,
+        "✅ Setup Complete!" if not args.dry_run else "✅ Dry Run Complete!",
+        "=" * 65,
+        f"  User stories processed: {successful}",
+        f"  Failures: {failed}",
+        f"  Total: {len(user_stories)}",
+    ]
     
     if not args.dry_run:
-        print(f"\nView your project:")
-        print(f"  Issues: https://github.com/{args.owner}/{args.repo}/issues")
-        print(f"  Milestones: https://github.com/{args.owner}/{args.repo}/milestones")
-        print(f"  Projects: https://github.com/{args.owner}/{args.repo}/projects")
+        summary.extend([
+            f"\nView your project:",
+            f"  Issues: https://github.com/{args.owner}/{args.repo}/issues",
+            f"  Milestones: https://github.com/{args.owner}/{args.repo}/milestones",
+            f"  Projects: https://github.com/{args.owner}/{args.repo}/projects",
+        ])
     else:
-        print("\nThis was a dry run. Run without --dry-run to create for real.")
+        summary.append("\nThis was a dry run. Run without --dry-run to create for real.")
     
-    print()
+    summary.append('')
+    write_lines(summary)
 
 
 if __name__ == "__main__":